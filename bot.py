@@ -5,9 +5,15 @@ Uses channel history and a knowledge base to provide contextual, accurate respon
 
 import os
 import re
+import ssl
 import time
+import heapq
+import pickle
 import logging
 import threading
+from functools import lru_cache
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
 import schedule
@@ -15,9 +21,22 @@ import schedule
 from dotenv import load_dotenv
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
+from slack_sdk import WebClient
+from slack_sdk.http_retry.builtin_handlers import (
+    ConnectionErrorRetryHandler,
+    RateLimitErrorRetryHandler,
+)
 import anthropic
 
+try:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+except ImportError:  # optional: only used to score very large histories
+    csr_matrix = None
+
+import semantic_search
 from knowledge_base import get_relevant_knowledge
+from tokenize_utils import tokenise as _tokenise
 from integrations.navan import NavanClient
 
 load_dotenv()
@@ -51,6 +70,9 @@ else:
     LISTEN_FINANCE_CHANNEL_ID = ASK_FINANCE_CHANNEL_ID
     LISTEN_NAVAN_CHANNEL_ID = ASK_NAVAN_CHANNEL_ID
 
+# On-disk copy of the history cache, so restarts can serve mentions immediately
+HISTORY_CACHE_PATH = os.environ.get("HISTORY_CACHE_PATH", "/tmp/slackbot_history.pkl")
+
 # Future Navan integration toggle
 NAVAN_ENABLED = False
 # When enabled, instantiate like:
@@ -62,7 +84,19 @@ NAVAN_ENABLED = False
 # ---------------------------------------------------------------------------
 # Slack & Anthropic clients
 # ---------------------------------------------------------------------------
-app = App(token=SLACK_BOT_TOKEN)
+# One Web API client shared by the event handlers and the refresh workers:
+# a single SSL context for every call, and transparent retries on dropped
+# connections and 429s (honouring Retry-After)
+slack_client = WebClient(
+    token=SLACK_BOT_TOKEN,
+    timeout=30,
+    ssl=ssl.create_default_context(),
+    retry_handlers=[
+        ConnectionErrorRetryHandler(),
+        RateLimitErrorRetryHandler(max_retry_count=3),
+    ],
+)
+app = App(client=slack_client)
 claude = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
 
 # ---------------------------------------------------------------------------
@@ -102,37 +136,142 @@ CHANNEL_CONFIG = {
 # History cache
 # ---------------------------------------------------------------------------
 # Populated on startup, refreshed every hour via a background thread.
-# Structure: {channel_id: {"messages": [...], "threads": {ts: [...]}, "last_refreshed": datetime}}
+# Structure: {channel_id: {"texts": [str], "tokens": [frozenset], "tss": [str],
+#                          "answers": [str], "postings": {token: [idx]},
+#                          "semantic_index": SemanticIndex | None,
+#                          "last_refreshed": datetime}}
+# The parallel lists describe each thread-starting human message that has a
+# human reply (its text, tokens, ts and first human reply); "postings" is an
+# inverted index into them, and "semantic_index" (when semantic search is
+# enabled) an embedding index over "texts".
 _history_cache: dict = {}
 
+# Entries with at least this many Q&A pairs also get a sparse message x token
+# matrix ("vocab", "matrix"), so keyword scoring is one matrix-vector product
+# instead of a Python loop over posting lists (requires numpy and scipy)
+SPARSE_SCORING_THRESHOLD = 10_000
+
+# Bumped whenever the cache entry structure changes, so stale pickles are ignored
+HISTORY_CACHE_VERSION = 2
+
+# One lock per channel so overlapping refreshes (startup catch-up, scheduler)
+# never fetch the same channel twice; entries are built locally, then swapped in
+_refresh_locks: dict[str, threading.Lock] = defaultdict(threading.Lock)
+_cache_save_lock = threading.Lock()
+
+# Matches the hourly refresh schedule; persisted entries older than this are stale
+CACHE_REFRESH_INTERVAL = timedelta(hours=1)
+
+# Thread replies are fetched concurrently during refresh at full speed; when
+# Slack answers 429, the client's RateLimitErrorRetryHandler waits out
+# Retry-After and retries.  The pool is long-lived so hourly refreshes reuse
+# the same workers instead of spinning up a fresh pool each time.
+THREAD_FETCH_WORKERS = 8
+
+_thread_fetch_pool = ThreadPoolExecutor(
+    max_workers=THREAD_FETCH_WORKERS, thread_name_prefix="thread-fetch",
+)
+
+
+def _build_semantic_index(
+    channel_id: str, texts: list[str], tss: list[str],
+) -> "semantic_search.SemanticIndex | None":
+    """
+    Embed *texts* (keyed by message *tss*) into a semantic index, reusing
+    vectors from the channel's previous cache entry.  Returns None when
+    semantic search is disabled or embedding fails, leaving keyword matching
+    in place.
+    """
+    if not semantic_search.is_enabled():
+        return None
+    previous = _history_cache.get(channel_id, {}).get("semantic_index")
+    try:
+        return semantic_search.build_index(texts, tss, previous=previous)
+    except Exception:
+        logger.exception(
+            "Failed to build semantic index for channel %s — using keyword matching.",
+            channel_id,
+        )
+        return None
+
 
 def _refresh_single_channel(channel_id: str) -> dict:
     """Fetch channel history and all thread replies, returning a cache entry."""
     logger.info("Refreshing cache for channel %s …", channel_id)
     messages = fetch_channel_history(channel_id)
 
+    # Only human thread starters can become Q&A pairs, so only fetch their threads
+    parents = [msg for msg in messages if _is_qa_candidate(msg)]
+
     threads: dict[str, list[dict]] = {}
-    for msg in messages:
-        if int(msg.get("reply_count", 0)) > 0:
-            thread_ts = msg["ts"]
-            try:
-                threads[thread_ts] = fetch_thread_replies(channel_id, thread_ts)
-            except Exception:
-                logger.warning(
-                    "Failed to fetch thread %s in channel %s — skipping.",
-                    thread_ts, channel_id,
-                )
-            time.sleep(0.5)  # respect Slack rate limits during bulk fetch
+    futures = {
+        _thread_fetch_pool.submit(fetch_thread_replies, channel_id, msg["ts"]): msg["ts"]
+        for msg in parents
+    }
+    for future in as_completed(futures):
+        thread_ts = futures[future]
+        try:
+            threads[thread_ts] = future.result()
+        except Exception:
+            logger.warning(
+                "Failed to fetch thread %s in channel %s — skipping.",
+                thread_ts, channel_id,
+            )
+
+    entry = _build_qa_entry(parents, threads)
+    entry["semantic_index"] = _build_semantic_index(channel_id, entry["texts"], entry["tss"])
+    entry["last_refreshed"] = datetime.now()
 
     logger.info(
-        "Cache refreshed for channel %s: %d messages, %d threads.",
-        channel_id, len(messages), len(threads),
+        "Cache refreshed for channel %s: %d messages, %d threads, %d Q&A pairs.",
+        channel_id, len(messages), len(threads), len(entry["texts"]),
     )
-    return {
-        "messages": messages,
-        "threads": threads,
-        "last_refreshed": datetime.now(),
+    return entry
+
+
+def _save_history_cache() -> None:
+    """Write the history cache to disk atomically (temp file + rename)."""
+    tmp_path = HISTORY_CACHE_PATH + ".tmp"
+    try:
+        with _cache_save_lock:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    {"version": HISTORY_CACHE_VERSION, "channels": dict(_history_cache)},
+                    f, protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, HISTORY_CACHE_PATH)
+    except Exception:
+        logger.exception("Failed to persist history cache to %s.", HISTORY_CACHE_PATH)
+
+
+def _load_history_cache() -> bool:
+    """
+    Populate the history cache from disk with entries newer than
+    CACHE_REFRESH_INTERVAL.  Returns True if every history source channel
+    was loaded.
+    """
+    try:
+        with open(HISTORY_CACHE_PATH, "rb") as f:
+            saved = pickle.load(f)
+    except FileNotFoundError:
+        return False
+    except Exception:
+        logger.exception("Failed to load history cache from %s.", HISTORY_CACHE_PATH)
+        return False
+
+    if not isinstance(saved, dict) or saved.get("version") != HISTORY_CACHE_VERSION:
+        logger.info("Ignoring history cache in an outdated format at %s.", HISTORY_CACHE_PATH)
+        return False
+
+    cutoff = datetime.now() - CACHE_REFRESH_INTERVAL
+    for channel_id, entry in saved["channels"].items():
+        if entry["last_refreshed"] >= cutoff:
+            _history_cache[channel_id] = entry
+
+    source_channels = {
+        config["history_source"] for config in CHANNEL_CONFIG.values()
     }
+    return source_channels <= _history_cache.keys()
 
 
 def refresh_cache() -> None:
@@ -142,49 +281,166 @@ def refresh_cache() -> None:
         config["history_source"] for config in CHANNEL_CONFIG.values()
     }
     for channel_id in source_channels:
+        lock = _refresh_locks[channel_id]
+        if not lock.acquire(blocking=False):
+            logger.info("Refresh already in progress for channel %s — skipping.", channel_id)
+            continue
         try:
-            _history_cache[channel_id] = _refresh_single_channel(channel_id)
+            new_entry = _refresh_single_channel(channel_id)
         except Exception:
             logger.exception(
                 "Failed to refresh cache for channel %s.", channel_id,
             )
+            continue
+        finally:
+            lock.release()
+        # Swap in the complete entry so readers never see a partial refresh
+        _history_cache[channel_id] = new_entry
+        _save_history_cache()
 
 
 def _run_scheduler() -> None:
     """Run the schedule loop in a background daemon thread."""
     while True:
+        # Sleep until the next job is due rather than polling every second
+        idle = schedule.idle_seconds()
+        if idle is None:
+            break  # nothing scheduled
+        if idle > 0:
+            time.sleep(idle)
         schedule.run_pending()
-        time.sleep(1)
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _extract_question_text(text: str, bot_user_id: str) -> str:
+@lru_cache(maxsize=1)
+def _bot_user_id() -> str:
+    """Return the bot's own user ID, resolved once via auth.test."""
+    return app.client.auth_test()["user_id"]
+
+
+@lru_cache(maxsize=1)
+def _mention_re() -> re.Pattern:
+    """Compiled pattern matching an @mention of the bot."""
+    return re.compile(rf"<@{re.escape(_bot_user_id())}>")
+
+
+def _extract_question_text(text: str) -> str:
     """Strip the @mention from the message to get the raw question."""
-    cleaned = re.sub(rf"<@{bot_user_id}>", "", text).strip()
+    cleaned = _mention_re().sub("", text).strip()
     return cleaned
 
 
-def _tokenise(text: str) -> set[str]:
-    """Lowercase tokenisation for keyword overlap matching."""
-    stopwords = {
-        "a", "an", "the", "is", "are", "was", "were", "be", "been", "being",
-        "have", "has", "had", "do", "does", "did", "will", "would", "shall",
-        "should", "may", "might", "must", "can", "could", "i", "me", "my",
-        "we", "our", "you", "your", "he", "she", "it", "they", "them", "and",
-        "or", "but", "in", "on", "at", "to", "for", "of", "with", "by",
-        "from", "as", "into", "about", "that", "this", "what", "which", "who",
-        "how", "when", "where", "why", "not", "no", "so", "if", "then",
+def _is_qa_candidate(msg: dict) -> bool:
+    """True if *msg* is a human message that started a thread."""
+    if msg.get("bot_id") or msg.get("subtype") == "bot_message":
+        return False
+    return int(msg.get("reply_count", 0)) > 0
+
+
+def _first_human_reply(parent_ts: str, replies: list[dict]) -> str | None:
+    """Return the text of the first human reply in a thread, or None if there isn't one."""
+    for r in replies:
+        if (
+            r["ts"] != parent_ts
+            and not r.get("bot_id")
+            and r.get("subtype") != "bot_message"
+        ):
+            return r.get("text", "")
+    return None
+
+
+def _build_qa_entry(
+    parents: list[dict],
+    threads: dict[str, list[dict]] | None = None,
+) -> dict:
+    """
+    Build the Q&A index over thread-starting human messages *parents* in a
+    single pass: parallel "texts", "tokens", "tss" and "answers" lists plus
+    an inverted "postings" index {token: [idx]} into them, so question
+    matching never has to re-tokenise cached history.
+
+    When *threads* is given, parents without a human reply are dropped and
+    "answers" holds each first human reply; otherwise answers are None and
+    left for the caller to resolve.
+    """
+    texts: list[str] = []
+    tokens: list[frozenset[str]] = []
+    tss: list[str] = []
+    answers: list[str | None] = []
+    postings: dict[str, list[int]] = defaultdict(list)
+
+    for msg in parents:
+        answer = None
+        if threads is not None:
+            answer = _first_human_reply(msg["ts"], threads.get(msg["ts"], []))
+            if answer is None:
+                continue
+
+        i = len(texts)
+        text = msg.get("text", "")
+        msg_tokens = frozenset(_tokenise(text))
+        for tok in msg_tokens:
+            postings[tok].append(i)
+
+        texts.append(text)
+        tokens.append(msg_tokens)
+        tss.append(msg["ts"])
+        answers.append(answer)
+
+    entry = {
+        "texts": texts,
+        "tokens": tokens,
+        "tss": tss,
+        "answers": answers,
+        "postings": dict(postings),
     }
-    words = set(re.findall(r"[a-z0-9]+", text.lower()))
-    return words - stopwords
+    if csr_matrix is not None and len(texts) >= SPARSE_SCORING_THRESHOLD:
+        entry["vocab"], entry["matrix"] = _build_token_matrix(entry["postings"], len(texts))
+    return entry
 
 
-def _similarity(text_a: str, text_b: str) -> int:
-    """Return the number of overlapping non-stopword tokens."""
-    return len(_tokenise(text_a) & _tokenise(text_b))
+def _build_token_matrix(
+    postings: dict[str, list[int]], n_rows: int,
+) -> tuple[dict[str, int], "csr_matrix"]:
+    """
+    Encode *postings* as a binary (n_rows x vocabulary) CSR matrix, returning
+    it with the {token: column} vocabulary.
+    """
+    vocab = {tok: col for col, tok in enumerate(postings)}
+    rows = np.fromiter(
+        (i for idxs in postings.values() for i in idxs), dtype=np.int32,
+    )
+    cols = np.repeat(
+        np.arange(len(vocab), dtype=np.int32),
+        [len(idxs) for idxs in postings.values()],
+    )
+    data = np.ones(len(rows), dtype=np.int32)
+    matrix = csr_matrix((data, (rows, cols)), shape=(n_rows, len(vocab)))
+    return vocab, matrix
+
+
+def _keyword_hits(
+    entry: dict, q_tokens: frozenset[str], min_overlap: int,
+) -> list[tuple[int, int]]:
+    """
+    Return (index, overlap) for every Q&A pair in *entry* sharing at least
+    *min_overlap* of the question's tokens *q_tokens*, in history order.
+    """
+    if "matrix" in entry:
+        vocab = entry["vocab"]
+        q_vec = np.zeros(len(vocab), dtype=np.int32)
+        q_vec[[vocab[tok] for tok in q_tokens if tok in vocab]] = 1
+        scores = entry["matrix"] @ q_vec
+        return [(int(i), int(scores[i])) for i in np.flatnonzero(scores >= min_overlap)]
+
+    # Count overlapping tokens only for messages sharing at least one token
+    counts: Counter[int] = Counter()
+    for tok in q_tokens:
+        counts.update(entry["postings"].get(tok, ()))
+    return [(i, counts[i]) for i in sorted(counts) if counts[i] >= min_overlap]
 
 
 def fetch_channel_history(channel_id: str, days: int = 30) -> list[dict]:
@@ -200,14 +456,19 @@ def fetch_channel_history(channel_id: str, days: int = 30) -> list[dict]:
         kwargs = {
             "channel": channel_id,
             "oldest": oldest,
-            "limit": 200,
+            "limit": 999,  # Slack's documented maximum page size
             "inclusive": True,
         }
         if cursor:
             kwargs["cursor"] = cursor
 
         resp = app.client.conversations_history(**kwargs)
-        messages.extend(resp["messages"])
+        page = resp["messages"]
+        messages.extend(page)
+
+        # Pages run newest-first; stop once we've reached the window's start
+        if page and float(page[-1]["ts"]) < float(oldest):
+            break
 
         cursor = resp.get("response_metadata", {}).get("next_cursor")
         if not cursor:
@@ -229,6 +490,7 @@ def fetch_thread_replies(channel_id: str, thread_ts: str) -> list[dict]:
 def find_similar_qa_pairs(
     channel_id: str,
     question: str,
+    q_tokens: frozenset[str],
     top_n: int = 3,
     min_overlap: int = 3,
 ) -> list[dict]:
@@ -236,69 +498,72 @@ def find_similar_qa_pairs(
     Look through cached channel history for messages that:
       1. Are not bot messages
       2. Have thread replies from humans
-      3. Share at least *min_overlap* keywords with the new question
+      3. Share at least *min_overlap* of the new question's tokens
+         *q_tokens*, or,
+         when the channel has a semantic index, are among its nearest
+         neighbours within semantic_search.MAX_DISTANCE
 
-    Returns the top-N matches as {question, answer, score} dicts.
+    Returns the top-N matches as {question, answer, score} dicts, where
+    score is the keyword overlap or the cosine similarity respectively.
     """
-    cache_entry = _history_cache.get(channel_id)
+    entry = _history_cache.get(channel_id)
 
-    if cache_entry:
-        history = cache_entry["messages"]
-        cached_threads = cache_entry["threads"]
-    else:
+    if not entry:
         logger.warning(
             "Cache miss for channel %s — falling back to live API.", channel_id,
         )
-        history = fetch_channel_history(channel_id)
-        cached_threads = {}
+        entry = _build_qa_entry(
+            [msg for msg in fetch_channel_history(channel_id) if _is_qa_candidate(msg)]
+        )
 
-    candidates: list[dict] = []
+    hits: list[tuple[int, float]] | None = None
 
-    for msg in history:
-        # Skip bot messages
-        if msg.get("bot_id") or msg.get("subtype") == "bot_message":
-            continue
-        # Only consider messages that started a thread
-        if int(msg.get("reply_count", 0)) == 0:
-            continue
+    semantic_index = entry.get("semantic_index")
+    if semantic_index is not None:
+        try:
+            hits = semantic_index.query(question, k=top_n)
+        except Exception:
+            logger.warning(
+                "Semantic lookup failed for channel %s — using keyword matching.",
+                channel_id,
+            )
 
-        score = _similarity(question, msg.get("text", ""))
-        if score < min_overlap:
-            continue
+    if hits is None:
+        # History order, so equal scores keep their original ranking
+        hits = _keyword_hits(entry, q_tokens, min_overlap)
 
-        # Get thread replies from cache, or fetch live as fallback
-        thread_ts = msg["ts"]
-        replies = cached_threads.get(thread_ts) or fetch_thread_replies(channel_id, thread_ts)
-        human_replies = [
-            r for r in replies
-            if r["ts"] != msg["ts"]
-            and not r.get("bot_id")
-            and r.get("subtype") != "bot_message"
-        ]
-        if not human_replies:
-            continue
+    candidates: list[dict] = []
+
+    for i, score in hits:
+        # Cached entries carry their answer; on the live fallback fetch it now
+        answer = entry["answers"][i]
+        if answer is None:
+            thread_ts = entry["tss"][i]
+            answer = _first_human_reply(thread_ts, fetch_thread_replies(channel_id, thread_ts))
+            if answer is None:
+                continue
 
         # Use the first human reply as the canonical answer
         candidates.append({
-            "question": msg.get("text", ""),
-            "answer": human_replies[0].get("text", ""),
+            "question": entry["texts"][i],
+            "answer": answer,
             "score": score,
         })
 
-    # Sort by relevance and return top N
-    candidates.sort(key=lambda c: c["score"], reverse=True)
-    return candidates[:top_n]
+    # Return the top N by relevance
+    return heapq.nlargest(top_n, candidates, key=lambda c: c["score"])
 
 
 def build_prompt_messages(
     channel_id: str,
     question: str,
+    q_tokens: frozenset[str],
     similar_qa: list[dict],
 ) -> list[dict]:
     """
     Assemble the messages list for the Claude API call, including:
-      - System prompt (channel-specific)
-      - Knowledge base context
+      - System prompt (channel-specific, prompt-cached)
+      - Knowledge base context (prompt-cached)
       - Similar past Q&A pairs
       - The user's question
     """
@@ -306,16 +571,11 @@ def build_prompt_messages(
     channel_type = config["type"]
 
     # Gather knowledge-base context
-    kb_context = get_relevant_knowledge(channel_type, question)
+    kb_context = get_relevant_knowledge(channel_type, q_tokens)
 
     # Build context sections
     context_parts: list[str] = []
 
-    if kb_context:
-        context_parts.append(
-            "## Relevant Company Policy / Knowledge Base\n" + kb_context
-        )
-
     if similar_qa:
         qa_text = "\n\n".join(
             f"Q: {qa['question']}\nA: {qa['answer']}" for qa in similar_qa
@@ -335,15 +595,35 @@ def build_prompt_messages(
         user_content += "\n\n".join(context_parts) + "\n\n"
     user_content += f"## New Question\n{question}"
 
+    # The system prompt and knowledge-base section repeat across questions, so
+    # mark them as prompt-cache breakpoints; only the blocks after them vary.
+    content_blocks: list[dict] = []
+    if kb_context:
+        content_blocks.append({
+            "type": "text",
+            "text": "## Relevant Company Policy / Knowledge Base\n" + kb_context + "\n\n",
+            "cache_control": {"type": "ephemeral"},
+        })
+    content_blocks.append({"type": "text", "text": user_content})
+
     return {
-        "system": config["system_prompt"],
-        "messages": [{"role": "user", "content": user_content}],
+        "system": [{
+            "type": "text",
+            "text": config["system_prompt"],
+            "cache_control": {"type": "ephemeral"},
+        }],
+        "messages": [{"role": "user", "content": content_blocks}],
     }
 
 
-def ask_claude(channel_id: str, question: str, similar_qa: list[dict]) -> str:
+def ask_claude(
+    channel_id: str,
+    question: str,
+    q_tokens: frozenset[str],
+    similar_qa: list[dict],
+) -> str:
     """Send the question and context to Claude and return the response text."""
-    prompt_data = build_prompt_messages(channel_id, question, similar_qa)
+    prompt_data = build_prompt_messages(channel_id, question, q_tokens, similar_qa)
 
     response = claude.messages.create(
         model="claude-sonnet-4-20250514",
@@ -359,9 +639,53 @@ def ask_claude(channel_id: str, question: str, similar_qa: list[dict]) -> str:
 # Slack event handler
 # ---------------------------------------------------------------------------
 
+# Mentions are answered off the Socket Mode thread so Slack gets its ack within
+# 3 seconds; event IDs are remembered briefly so Slack retries aren't answered twice.
+MENTION_WORKERS = 8
+EVENT_DEDUP_TTL_SECONDS = 600
+
+_mention_pool = ThreadPoolExecutor(max_workers=MENTION_WORKERS, thread_name_prefix="mention")
+_seen_events: dict[str, float] = {}
+_seen_events_lock = threading.Lock()
+
+
+def _is_duplicate_event(event_id: str | None) -> bool:
+    """Record *event_id*, returning True if it was already seen within the TTL."""
+    if not event_id:
+        return False
+    now = time.monotonic()
+    with _seen_events_lock:
+        # Insertion order is arrival order, so expired IDs are at the front
+        for seen_id, seen_at in list(_seen_events.items()):
+            if now - seen_at < EVENT_DEDUP_TTL_SECONDS:
+                break
+            del _seen_events[seen_id]
+        if event_id in _seen_events:
+            return True
+        _seen_events[event_id] = now
+        return False
+
+
+def _log_worker_failure(future) -> None:
+    """Log any exception that escaped a mention worker."""
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Unhandled error answering mention.", exc_info=exc)
+
+
 @app.event("app_mention")
-def handle_mention(event, say):
-    """Respond to @mentions in configured channels."""
+def handle_mention(ack, body, event, say):
+    """Acknowledge @mentions immediately and answer them on a worker thread."""
+    ack()
+    event_id = body.get("event_id")
+    if _is_duplicate_event(event_id):
+        logger.info("Ignoring duplicate delivery of event %s.", event_id)
+        return
+    _mention_pool.submit(_answer_mention, event, say).add_done_callback(_log_worker_failure)
+
+
+def _answer_mention(event: dict, say) -> None:
+    """Respond to an @mention in a configured channel."""
     channel_id = event.get("channel")
     thread_ts = event.get("thread_ts") or event.get("ts")
     user = event.get("user")
@@ -373,8 +697,7 @@ def handle_mention(event, say):
     config = CHANNEL_CONFIG[channel_id]
     channel_type = config["type"]
     history_source = config["history_source"]
-    bot_user_id = app.client.auth_test()["user_id"]
-    question = _extract_question_text(event.get("text", ""), bot_user_id)
+    question = _extract_question_text(event.get("text", ""))
 
     if not question:
         say(
@@ -388,13 +711,16 @@ def handle_mention(event, say):
         channel_type, user, question[:120],
     )
 
+    # Tokenise once; history matching and knowledge-base lookup share the result
+    q_tokens = frozenset(_tokenise(question))
+
     try:
         # Find similar past Q&A (reads from real channel history, even in test mode)
-        similar_qa = find_similar_qa_pairs(history_source, question)
+        similar_qa = find_similar_qa_pairs(history_source, question, q_tokens)
         logger.info("Found %d similar past Q&A pairs.", len(similar_qa))
 
         # Ask Claude (use listen channel_id for config lookup)
-        answer = ask_claude(channel_id, question, similar_qa)
+        answer = ask_claude(channel_id, question, q_tokens, similar_qa)
 
         say(text=answer, thread_ts=thread_ts)
         logger.info("Replied in thread %s.", thread_ts)
@@ -417,10 +743,18 @@ def handle_mention(event, say):
 if __name__ == "__main__":
     logger.info("Starting Slack bot in Socket Mode…")
 
-    # Populate cache on startup (blocks until ready)
-    logger.info("Populating history cache for all channels…")
-    refresh_cache()
-    logger.info("History cache populated.")
+    # Resolve the bot user ID up front so the first mention doesn't pay for it
+    logger.info("Bot user ID: %s", _bot_user_id())
+
+    # Serve from the on-disk cache if it's fresh, catching up in the background;
+    # otherwise populate the cache on startup (blocks until ready)
+    if _load_history_cache():
+        logger.info("Loaded history cache from %s; refreshing in background.", HISTORY_CACHE_PATH)
+        threading.Thread(target=refresh_cache, daemon=True).start()
+    else:
+        logger.info("Populating history cache for all channels…")
+        refresh_cache()
+        logger.info("History cache populated.")
 
     # Schedule hourly cache refresh in a background thread
     schedule.every(1).hours.do(refresh_cache)
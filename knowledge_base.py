@@ -6,7 +6,9 @@ The get_relevant_knowledge() function does simple keyword matching
 to return the most relevant sections for a given question.
 """
 
-import re
+from functools import lru_cache
+
+from tokenize_utils import tokenise as _tokenise
 
 KNOWLEDGE_BASE: dict[str, dict[str, str]] = {
     # ------------------------------------------------------------------
@@ -163,38 +165,59 @@ KNOWLEDGE_BASE: dict[str, dict[str, str]] = {
 }
 
 
-def _tokenise(text: str) -> set[str]:
-    """Lowercase tokenisation — mirrors the bot's tokeniser."""
-    stopwords = {
-        "a", "an", "the", "is", "are", "was", "were", "be", "been", "being",
-        "have", "has", "had", "do", "does", "did", "will", "would", "shall",
-        "should", "may", "might", "must", "can", "could", "i", "me", "my",
-        "we", "our", "you", "your", "he", "she", "it", "they", "them", "and",
-        "or", "but", "in", "on", "at", "to", "for", "of", "with", "by",
-        "from", "as", "into", "about", "that", "this", "what", "which", "who",
-        "how", "when", "where", "why", "not", "no", "so", "if", "then",
+# Precomputed at import: each topic's tokens (title + content), and an
+# inverted index {token: [topic, ...]} per channel type.
+_TOPIC_TOKENS: dict[str, dict[str, frozenset[str]]] = {
+    channel_type: {
+        topic: frozenset(_tokenise(topic) | _tokenise(content))
+        for topic, content in topics.items()
     }
-    words = set(re.findall(r"[a-z0-9]+", text.lower()))
-    return words - stopwords
+    for channel_type, topics in KNOWLEDGE_BASE.items()
+}
+
+
+def _build_topic_index(topic_tokens: dict[str, frozenset[str]]) -> dict[str, list[str]]:
+    """Invert {topic: tokens} into {token: [topic, ...]}."""
+    index: dict[str, list[str]] = {}
+    for topic, tokens in topic_tokens.items():
+        for token in tokens:
+            index.setdefault(token, []).append(topic)
+    return index
 
 
-def get_relevant_knowledge(channel_type: str, question: str) -> str:
+_TOPIC_INDEX: dict[str, dict[str, list[str]]] = {
+    channel_type: _build_topic_index(topic_tokens)
+    for channel_type, topic_tokens in _TOPIC_TOKENS.items()
+}
+
+
+@lru_cache(maxsize=1024)
+def get_relevant_knowledge(channel_type: str, q_tokens: frozenset[str]) -> str:
     """
     Return concatenated knowledge-base content whose topics share at least
-    one keyword with the question.  Returns an empty string if nothing matches.
+    one keyword with the question's tokens *q_tokens* (as produced by
+    tokenize_utils.tokenise).  Returns an empty string if nothing matches.
+
+    Results are memoised per (channel type, token set); call
+    get_relevant_knowledge.cache_clear() if KNOWLEDGE_BASE changes.
     """
     topics = KNOWLEDGE_BASE.get(channel_type, {})
     if not topics:
         return ""
 
-    q_tokens = _tokenise(question)
-    matches: list[tuple[int, str, str]] = []
+    # Score only the topics sharing a token with the question
+    index = _TOPIC_INDEX[channel_type]
+    overlaps: dict[str, int] = {}
+    for token in q_tokens:
+        for topic in index.get(token, ()):
+            overlaps[topic] = overlaps.get(topic, 0) + 1
 
-    for topic, content in topics.items():
-        topic_tokens = _tokenise(topic) | _tokenise(content)
-        overlap = len(q_tokens & topic_tokens)
-        if overlap > 0:
-            matches.append((overlap, topic, content))
+    # Keep knowledge-base order so equal scores rank as they're defined
+    matches: list[tuple[int, str, str]] = [
+        (overlaps[topic], topic, content)
+        for topic, content in topics.items()
+        if topic in overlaps
+    ]
 
     # Sort by relevance
     matches.sort(key=lambda m: m[0], reverse=True)
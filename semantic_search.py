@@ -0,0 +1,112 @@
+"""
+Optional semantic matching for past channel Q&A.
+
+Embeds thread-starting questions with Voyage AI and indexes them in an HNSW
+approximate-nearest-neighbour index (hnswlib), so paraphrased questions can
+be matched without a linear scan.  Enabled only when VOYAGE_API_KEY is set
+and the optional dependencies are installed; otherwise the bot keeps using
+keyword-overlap matching.
+"""
+
+import os
+from functools import lru_cache
+
+try:
+    import hnswlib
+    import numpy as np
+    import voyageai
+except ImportError:  # optional dependencies
+    hnswlib = None
+
+EMBEDDING_MODEL = "voyage-3"
+EMBEDDING_DIM = 1024
+EMBED_BATCH_SIZE = 100
+
+# Cosine distance (1 - cosine similarity) above which a match is discarded
+MAX_DISTANCE = 0.35
+
+
+def is_enabled() -> bool:
+    """Return True if semantic matching is configured and its dependencies are installed."""
+    return hnswlib is not None and bool(os.environ.get("VOYAGE_API_KEY"))
+
+
+@lru_cache(maxsize=1)
+def _client() -> "voyageai.Client":
+    return voyageai.Client(api_key=os.environ["VOYAGE_API_KEY"])
+
+
+def _embed(texts: list[str], input_type: str) -> "np.ndarray":
+    """Embed *texts* in batches, returning a (len(texts), EMBEDDING_DIM) float32 array."""
+    vectors: list[list[float]] = []
+    for start in range(0, len(texts), EMBED_BATCH_SIZE):
+        # The API rejects empty strings (e.g. file-only messages)
+        batch = [text or " " for text in texts[start:start + EMBED_BATCH_SIZE]]
+        result = _client().embed(batch, model=EMBEDDING_MODEL, input_type=input_type)
+        vectors.extend(result.embeddings)
+    return np.asarray(vectors, dtype=np.float32).reshape(-1, EMBEDDING_DIM)
+
+
+class SemanticIndex:
+    """
+    HNSW index over embedded questions.  Item ids are positions in the list
+    of texts the index was built from.
+
+    Pickles as its raw vectors and rebuilds the HNSW graph on load, so the
+    persisted history cache never needs re-embedding after a restart.
+    """
+
+    def __init__(self, keys: list[str], vectors: "np.ndarray"):
+        self.keys = keys
+        self.vectors = vectors
+        self._index = hnswlib.Index(space="cosine", dim=EMBEDDING_DIM)
+        self._index.init_index(max_elements=len(keys), ef_construction=200, M=16)
+        self._index.add_items(vectors, np.arange(len(keys)))
+
+    def __getstate__(self) -> dict:
+        return {"keys": self.keys, "vectors": self.vectors}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["keys"], state["vectors"])
+
+    def query(self, question: str, k: int) -> list[tuple[int, float]]:
+        """
+        Return up to *k* (item_id, similarity) pairs within MAX_DISTANCE of
+        *question*, most similar first.
+        """
+        k = min(k, len(self.keys))
+        self._index.set_ef(max(50, k))
+        ids, distances = self._index.knn_query(_embed([question], "query"), k=k)
+        return [
+            (int(i), 1.0 - float(d))
+            for i, d in zip(ids[0], distances[0])
+            if d < MAX_DISTANCE
+        ]
+
+
+def build_index(
+    texts: list[str],
+    keys: list[str],
+    previous: SemanticIndex | None = None,
+) -> SemanticIndex | None:
+    """
+    Build a SemanticIndex over *texts*, identified by *keys* (message ts).
+    Vectors for keys already present in *previous* are reused rather than
+    re-embedded.  Returns None if there is nothing to index.
+    """
+    if not texts:
+        return None
+
+    known: dict[str, "np.ndarray"] = {}
+    if previous is not None:
+        known = dict(zip(previous.keys, previous.vectors))
+
+    missing = [i for i, key in enumerate(keys) if key not in known]
+    vectors = np.empty((len(keys), EMBEDDING_DIM), dtype=np.float32)
+    if missing:
+        vectors[missing] = _embed([texts[i] for i in missing], "document")
+    for i, key in enumerate(keys):
+        if key in known:
+            vectors[i] = known[key]
+
+    return SemanticIndex(keys, vectors)
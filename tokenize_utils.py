@@ -0,0 +1,23 @@
+"""
+Keyword tokenisation shared by the bot's history matching and the
+knowledge-base lookup.
+"""
+
+import re
+
+STOPWORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "being",
+    "have", "has", "had", "do", "does", "did", "will", "would", "shall",
+    "should", "may", "might", "must", "can", "could", "i", "me", "my",
+    "we", "our", "you", "your", "he", "she", "it", "they", "them", "and",
+    "or", "but", "in", "on", "at", "to", "for", "of", "with", "by",
+    "from", "as", "into", "about", "that", "this", "what", "which", "who",
+    "how", "when", "where", "why", "not", "no", "so", "if", "then",
+})
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenise(text: str) -> set[str]:
+    """Lowercase tokenisation for keyword overlap matching, minus stopwords."""
+    return {w for w in _TOKEN_RE.findall(text.lower()) if w not in STOPWORDS}